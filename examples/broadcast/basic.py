@@ -26,8 +26,8 @@ for i in range(10):
         "trial_type": random.choice(["practice", "experimental"]),
         "block_number": random.randint(1, 5),
         "session_id": f"S{random.randint(1, 3):02d}",
-        "trial_start_time": start_time.isoformat(),
-        "trial_stop_time": stop_time.isoformat(),
+        "trial_start_time": start_time,
+        "trial_stop_time": stop_time,
         "result": result,
         "correct_rate": correct_rate,
         "stimulus_type": random.choice(["visual", "auditory", "somatosensory"]),
@@ -25,8 +25,8 @@ for i in range(10):
             "group": random.choice(participant_groups),
         },
         "trial_info": {
-            "start_time": start_time.isoformat(),
-            "stop_time": stop_time.isoformat(),
+            "start_time": start_time,
+            "stop_time": stop_time,
             "result": result,
             "correct_rate": 1.0 if result == "correct" else 0.0,
         },
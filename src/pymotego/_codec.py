@@ -0,0 +1,143 @@
+"""Payload encoding helpers shared by pymoteGO clients."""
+
+import binascii
+import gzip
+import json
+from collections.abc import Iterable, Mapping
+from datetime import date, datetime, time
+from typing import Any, Literal
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on installed extras
+    orjson = None
+
+try:
+    import pybase64
+except ImportError:  # pragma: no cover - depends on installed extras
+    pybase64 = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - depends on installed extras
+    msgpack = None
+
+try:
+    from compression import zstd  # Python 3.14+
+except ImportError:  # pragma: no cover - depends on interpreter and extras
+    try:
+        import zstandard as zstd
+    except ImportError:
+        zstd = None
+
+Compression = Literal["none", "gzip", "zstd", "auto"]
+Codec = Literal["json", "msgpack"]
+
+JSON_HEADERS = {"content-type": "application/json"}
+GZIP_JSON_HEADERS = {"content-type": "application/json", "content-encoding": "gzip"}
+ZSTD_JSON_HEADERS = {"content-type": "application/json", "content-encoding": "zstd"}
+MSGPACK_HEADERS = {"content-type": "application/msgpack"}
+
+# Below this size the compression header and CPU cost outweigh the savings.
+AUTO_COMPRESS_MIN_BYTES = 1024
+
+
+def json_dumps(obj: Any) -> bytes:
+    """Serialize `obj` to compact UTF-8 JSON, using orjson when installed.
+
+    Payloads orjson rejects (e.g. integers wider than 64 bits) go through the
+    stdlib encoder instead.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            )
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(
+        obj, separators=(",", ":"), ensure_ascii=False, default=_json_default
+    ).encode("utf-8")
+
+
+def json_loads(data: bytes) -> Any:
+    """Parse a JSON response body, using orjson when installed.
+
+    Takes the raw `Response.content` bytes so the body is never decoded to an
+    intermediate `str`, as `Response.json()` / `Response.text` would do.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def msgpack_dumps(obj: Any) -> bytes:
+    """Serialize `obj` to MessagePack, keeping `bytes` values as binary."""
+    return msgpack.packb(obj, use_bin_type=True)
+
+
+def b64encode(data: bytes) -> bytes:
+    """Base64-encode without newlines, using SIMD pybase64 when installed."""
+    if pybase64 is not None:
+        return pybase64.b64encode(data)
+    return binascii.b2a_base64(data, newline=False)
+
+
+def _json_default(obj: Any) -> Any:
+    """Mirror the orjson conversions for types stdlib json cannot encode."""
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def columnar_batch(records: Iterable[Mapping[str, Any]]) -> dict[str, Any]:
+    """Lay records out as `{"schema": [keys...], "rows": [[values...], ...]}`.
+
+    Keys are listed once in first-seen order; records lacking a key get `None`.
+    """
+    records = list(records)
+    schema = list(dict.fromkeys(key for record in records for key in record))
+    return {
+        "schema": schema,
+        "rows": [[record.get(key) for key in schema] for record in records],
+    }
+
+
+def gzip_dumps(obj: Any) -> bytes:
+    """Serialize `obj` to JSON and gzip it with a fast compression level."""
+    return gzip.compress(json_dumps(obj), compresslevel=1)
+
+
+def check_compression(compress: Compression) -> None:
+    """Reject unknown modes and zstd when no zstd codec is installed."""
+    if compress not in ("none", "gzip", "zstd", "auto"):
+        raise ValueError(f"Unsupported compression: {compress!r}")
+    if compress == "zstd" and zstd is None:
+        raise ImportError(
+            "zstd compression requires Python 3.14+ or the 'zstandard' package"
+        )
+
+
+def check_codec(codec: Codec) -> None:
+    """Reject unknown codecs and msgpack when the package is missing."""
+    if codec not in ("json", "msgpack"):
+        raise ValueError(f"Unsupported codec: {codec!r}")
+    if codec == "msgpack" and msgpack is None:
+        raise ImportError("msgpack codec requires the 'msgpack' package")
+
+
+def encode_body(body: bytes, compress: Compression) -> tuple[bytes, dict[str, str]]:
+    """Compress a JSON body according to `compress`, returning matching headers.
+
+    ``"auto"`` gzips bodies of at least `AUTO_COMPRESS_MIN_BYTES` and sends
+    smaller ones as is.
+    """
+    if compress == "none" or (
+        compress == "auto" and len(body) < AUTO_COMPRESS_MIN_BYTES
+    ):
+        return body, JSON_HEADERS
+    if compress == "zstd":
+        return zstd.compress(body, 3), ZSTD_JSON_HEADERS
+    return gzip.compress(body, compresslevel=1), GZIP_JSON_HEADERS
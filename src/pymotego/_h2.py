@@ -0,0 +1,137 @@
+"""HTTP/2 SETTINGS tuning for httpx async transports.
+
+httpx does not expose the SETTINGS frame a client sends when it opens an HTTP/2
+connection, so this module swaps in httpcore connection classes that advertise
+custom values. It overrides httpcore internals, which is why pyproject.toml pins
+httpcore to the 1.0.x line, and only affects clients given a `tuned_transport`.
+"""
+
+import h2.settings
+import httpcore
+import httpx
+
+
+class _TunedHTTP2Connection(httpcore.AsyncHTTP2Connection):
+    def __init__(
+        self, *args, h2_settings: dict[h2.settings.SettingCodes, int], **kwargs
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self._h2_settings = h2_settings
+
+    async def _send_connection_init(self, request: httpcore.Request) -> None:
+        # Mirrors httpcore's preface, with the tuned values merged in.
+        self._h2_state.local_settings = h2.settings.Settings(
+            client=True,
+            initial_values={
+                h2.settings.SettingCodes.ENABLE_PUSH: 0,
+                h2.settings.SettingCodes.MAX_CONCURRENT_STREAMS: 100,
+                h2.settings.SettingCodes.MAX_HEADER_LIST_SIZE: 65536,
+                **self._h2_settings,
+            },
+        )
+        del self._h2_state.local_settings[
+            h2.settings.SettingCodes.ENABLE_CONNECT_PROTOCOL
+        ]
+
+        self._h2_state.initiate_connection()
+        self._h2_state.increment_flow_control_window(2**24)
+        await self._write_outgoing_data(request)
+
+
+class _TunedHTTPConnection(httpcore.AsyncHTTPConnection):
+    def __init__(
+        self, *args, h2_settings: dict[h2.settings.SettingCodes, int], **kwargs
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self._h2_settings = h2_settings
+
+    async def handle_async_request(
+        self, request: httpcore.Request
+    ) -> httpcore.Response:
+        # Open the connection ourselves when ALPN selects h2; the base class then
+        # finds `_connection` set and only forwards the request.
+        if self._connection is None and self.can_handle_request(request.url.origin):
+            try:
+                async with self._request_lock:
+                    if self._connection is None:
+                        stream = await self._connect(request)
+                        ssl_object = stream.get_extra_info("ssl_object")
+                        if (
+                            ssl_object is not None
+                            and ssl_object.selected_alpn_protocol() == "h2"
+                        ):
+                            self._connection = _TunedHTTP2Connection(
+                                origin=self._origin,
+                                stream=stream,
+                                keepalive_expiry=self._keepalive_expiry,
+                                h2_settings=self._h2_settings,
+                            )
+                        else:
+                            self._connection = httpcore.AsyncHTTP11Connection(
+                                origin=self._origin,
+                                stream=stream,
+                                keepalive_expiry=self._keepalive_expiry,
+                            )
+            except BaseException:
+                self._connect_failed = True
+                raise
+        return await super().handle_async_request(request)
+
+
+class _TunedConnectionPool(httpcore.AsyncConnectionPool):
+    def __init__(
+        self, *args, h2_settings: dict[h2.settings.SettingCodes, int], **kwargs
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self._h2_settings = h2_settings
+
+    def create_connection(
+        self, origin: httpcore.Origin
+    ) -> httpcore.AsyncConnectionInterface:
+        return _TunedHTTPConnection(
+            origin=origin,
+            ssl_context=self._ssl_context,
+            keepalive_expiry=self._keepalive_expiry,
+            http1=self._http1,
+            http2=self._http2,
+            retries=self._retries,
+            local_address=self._local_address,
+            uds=self._uds,
+            network_backend=self._network_backend,
+            socket_options=self._socket_options,
+            h2_settings=self._h2_settings,
+        )
+
+
+def tuned_transport(
+    limits: httpx.Limits,
+    window_bytes: int | None = None,
+    max_streams: int | None = None,
+) -> httpx.AsyncHTTPTransport:
+    """Build an HTTP/2 transport advertising the given stream window and cap.
+
+    `window_bytes` sets SETTINGS_INITIAL_WINDOW_SIZE (per-stream receive window)
+    and `max_streams` sets SETTINGS_MAX_CONCURRENT_STREAMS, which httpcore also
+    uses as its cap on concurrent requests per connection.
+    """
+    h2_settings: dict[h2.settings.SettingCodes, int] = {}
+    if window_bytes is not None:
+        h2_settings[h2.settings.SettingCodes.INITIAL_WINDOW_SIZE] = window_bytes
+    if max_streams is not None:
+        h2_settings[h2.settings.SettingCodes.MAX_CONCURRENT_STREAMS] = max_streams
+
+    # httpx offers no hook for the pool class, so its freshly built (and still
+    # unused) pool is replaced; both share one SSL context so certificate
+    # loading happens once.
+    ssl_context = httpx.create_ssl_context()
+    transport = httpx.AsyncHTTPTransport(verify=ssl_context, http2=True, limits=limits)
+    transport._pool = _TunedConnectionPool(
+        ssl_context=ssl_context,
+        max_connections=limits.max_connections,
+        max_keepalive_connections=limits.max_keepalive_connections,
+        keepalive_expiry=limits.keepalive_expiry,
+        http1=True,
+        http2=True,
+        h2_settings=h2_settings,
+    )
+    return transport
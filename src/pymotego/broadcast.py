@@ -1,33 +1,164 @@
+import asyncio
+import atexit
 import httpx
-from concurrent.futures import ThreadPoolExecutor, Future
-from urllib.parse import urljoin
-from typing import Dict, Any
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Tuple
 
-from pymotego.constants import DEFAULT_API_BASE_URL
+from pymotego._codec import Compression
+from pymotego.broadcast_async import AsyncBroadcast
+from pymotego.constants import HTTP2_MULTIPLEXED
 
-_BASEURL = urljoin(DEFAULT_API_BASE_URL, "broadcast/data/")
+_Job = Tuple[Callable[..., Awaitable[Any]], Tuple[Any, ...], "Future[Any]"]
+_Item = Tuple[Dict[str, Any], "Future[httpx.Response]"]
 
 
 class Broadcast:
     """
     Asynchronous HTTP broadcast client for sending experimental data to cogmoteGO.
 
-    Uses a thread pool to execute non-blocking HTTP requests with HTTP/2 support.
-    All methods return Future objects for fire-and-forget usage patterns.
+    Drives an `AsyncBroadcast` on a dedicated event-loop thread with HTTP/2
+    support. All methods return Future objects for fire-and-forget usage
+    patterns.
+
+    Requests are issued concurrently over the shared pooled client, so the order
+    in which they reach the server is not guaranteed. Pass ``ordered=True`` to
+    send them one at a time in submission order.
+
+    Parameters
+    ----------
+    max_workers : int, optional
+        Number of requests in flight at once. Defaults to the
+        ``PYMOTEGO_WORKERS`` environment variable, or 16 when unset.
+    ordered : bool, optional
+        Send requests one at a time in submission order through a queue on the
+        event-loop thread. Overrides `max_workers`. Default is False.
+    connections : int, optional
+        Number of pooled connections to the server. When HTTP/2 is available
+        (https base URL) the default is a single connection carrying every
+        request as a multiplexed stream; otherwise it is one per worker, since
+        an HTTP/1.1 connection serves one request at a time. Raise it for bulky
+        uploads that benefit from several parallel TCP connections.
+    max_batch : int, optional
+        Number of records `send` buffers per endpoint before posting them as a
+        single JSON array. Default is 1, which posts every record on its own.
+    flush_interval : float, optional
+        Maximum number of seconds a buffered record waits before its endpoint's
+        buffer is flushed. Only used when `max_batch` is greater than 1.
+        Default is 0.05.
+    compress : {"none", "gzip", "zstd", "auto"}, optional
+        Request body compression. ``"auto"`` gzips bodies of 1 KiB or more;
+        ``"zstd"`` needs Python 3.14+ or the ``zstandard`` package. The server
+        must decode the ``Content-Encoding`` it receives. Default is "none".
+    h2_window_bytes : int, optional
+        HTTP/2 initial stream flow-control window advertised to the server,
+        e.g. ``1 << 20``. Default keeps httpx's value (64 KiB).
+    h2_max_streams : int, optional
+        HTTP/2 concurrent stream limit advertised to the server, which is also
+        the cap on requests in flight per connection, e.g. ``1000``. Default
+        keeps httpx's value (100).
+    prewarm : bool, optional
+        Issue a background request on construction so the pooled connection is
+        already open when the first record is sent. Default is False.
+
+    Notes
+    -----
+    Batched requests (`send_many`, or `send` with `max_batch > 1`) post a JSON
+    array whose elements are the individual records, so the target endpoint
+    must accept an array body.
+
+    Setting `h2_window_bytes` or `h2_max_streams` gives the client its own
+    transport, so proxies from the ``HTTP_PROXY``, ``HTTPS_PROXY`` and
+    ``ALL_PROXY`` environment variables are not used.
     """
 
-    def __init__(self) -> None:
-        self.executor = ThreadPoolExecutor(max_workers=1)
-        self.client = httpx.Client(http2=True)
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        ordered: bool = False,
+        connections: int | None = None,
+        max_batch: int = 1,
+        flush_interval: float = 0.05,
+        compress: Compression = "none",
+        h2_window_bytes: int | None = None,
+        h2_max_streams: int | None = None,
+        prewarm: bool = False,
+    ) -> None:
+        if ordered:
+            max_workers = 1
+        elif max_workers is None:
+            workers = os.environ.get("PYMOTEGO_WORKERS", "16")
+            try:
+                max_workers = int(workers)
+            except ValueError:
+                raise ValueError(
+                    f"PYMOTEGO_WORKERS must be an integer, got {workers!r}"
+                ) from None
+        if max_workers <= 0:
+            raise ValueError("max_workers must be greater than 0")
+        if max_batch <= 0:
+            raise ValueError("max_batch must be greater than 0")
+        if max_batch > 1 and flush_interval <= 0:
+            raise ValueError("flush_interval must be greater than 0")
+        if connections is None:
+            connections = 1 if HTTP2_MULTIPLEXED else max_workers
+        self._async = AsyncBroadcast(
+            connections=connections,
+            compress=compress,
+            h2_window_bytes=h2_window_bytes,
+            h2_max_streams=h2_max_streams,
+        )
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        # Per endpoint: arrival time of the oldest buffered record, and records.
+        self._buffers: Dict[str, Tuple[float, List[_Item]]] = {}
+        # Guards the buffers and the closed flag; batches are enqueued while it
+        # is held so that concurrent flushes keep submission order.
+        self._lock = threading.RLock()
+        self._closed = False
+        self._limit = asyncio.Semaphore(max_workers)
+        self._queue: asyncio.Queue[_Job] | None = asyncio.Queue() if ordered else None
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        self._tasks: List[Future[None]] = []
+        if self._queue is not None:
+            self._tasks.append(
+                asyncio.run_coroutine_threadsafe(self._consume(), self._loop)
+            )
+        if max_batch > 1:
+            self._tasks.append(
+                asyncio.run_coroutine_threadsafe(self._flush_loop(), self._loop)
+            )
+        if prewarm:
+            self._submit(self._async.list)
+        # The loop thread is a daemon, so drain pending sends at interpreter exit
+        # for instances that were never closed.
+        atexit.register(self.close)
 
     def close(self) -> None:
         """
-        Release HTTP client and thread pool resources.
+        Release HTTP client and event-loop resources.
 
         Should be called when the Broadcast instance is no longer needed.
+        Buffered records are flushed and in-flight requests are awaited before
+        the client is closed. Calling it again has no effect; it also runs
+        automatically at interpreter exit. Sending afterwards raises
+        `RuntimeError`.
         """
-        self.client.close()
-        self.executor.shutdown(wait=False)
+        with self._lock:
+            if self._closed:
+                return
+            self._flush()
+            self._closed = True
+        atexit.unregister(self.close)
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
 
     def send(
         self, data: Dict[str, Any], endpoint: str = "default"
@@ -45,14 +176,89 @@ class Broadcast:
         Returns
         -------
         Future[httpx.Response]
-            Future object containing HTTP response.
+            Future object containing HTTP response. When batching is enabled,
+            the response is the one of the batch the record was posted in.
 
         Examples
         --------
         >>> broadcaster = Broadcast()
         >>> future = broadcaster.send({"trial_id": 1, "result": "correct"})
         """
-        return self.executor.submit(self._post, endpoint, data)
+        if self.max_batch <= 1:
+            return self._submit(self._async.send, data, endpoint)
+
+        future: Future[httpx.Response] = Future()
+        with self._lock:
+            self._check_open()
+            _, items = self._buffers.setdefault(endpoint, (time.monotonic(), []))
+            items.append((data, future))
+            if len(items) >= self.max_batch:
+                del self._buffers[endpoint]
+                self._submit(self._deliver_batch, endpoint, items)
+        return future
+
+    def send_many(
+        self, data_list: Iterable[Dict[str, Any]], endpoint: str = "default"
+    ) -> Future[httpx.Response]:
+        """
+        Send several records to a broadcast endpoint in a single request.
+
+        Parameters
+        ----------
+        data_list : Iterable[Dict[str, Any]]
+            Payloads to be sent, serialized together as one JSON array.
+        endpoint : str, optional
+            Target endpoint name. Default is "default".
+
+        Returns
+        -------
+        Future[httpx.Response]
+            Future object containing HTTP response.
+
+        Examples
+        --------
+        >>> broadcaster = Broadcast()
+        >>> future = broadcaster.send_many([{"trial_id": 1}, {"trial_id": 2}])
+        """
+        return self._submit(self._async.send_many, list(data_list), endpoint)
+
+    def send_batch_columnar(
+        self, records: Iterable[Dict[str, Any]], endpoint: str = "default"
+    ) -> Future[httpx.Response]:
+        """
+        Send several records in a compact column-oriented, gzip-encoded body.
+
+        Field names are emitted once in a ``schema`` list and each record becomes
+        a row of values in that order, which pays off for homogeneous records
+        that repeat the same keys. Records missing a field send ``null`` for it.
+
+        Parameters
+        ----------
+        records : Iterable[Dict[str, Any]]
+            Payloads to be sent.
+        endpoint : str, optional
+            Target endpoint name. Default is "default".
+
+        Returns
+        -------
+        Future[httpx.Response]
+            Future object containing HTTP response.
+
+        Notes
+        -----
+        The body is ``{"schema": [...], "rows": [[...], ...]}`` sent with
+        ``Content-Encoding: gzip``; the server must decode this format. Use
+        `send_many` for servers that only accept plain record arrays.
+        """
+        return self._submit(self._async.send_batch_columnar, list(records), endpoint)
+
+    def flush(self) -> None:
+        """
+        Post all records currently buffered by `send`, one request per endpoint.
+        """
+        with self._lock:
+            self._check_open()
+            self._flush()
 
     def create(self, name: str) -> Future[httpx.Response]:
         """
@@ -68,7 +274,7 @@ class Broadcast:
         Future[httpx.Response]
             Future object containing HTTP response.
         """
-        return self.executor.submit(self._post_create, name)
+        return self._submit(self._async.create, name)
 
     def delete(self, name: str) -> Future[httpx.Response]:
         """
@@ -84,7 +290,7 @@ class Broadcast:
         Future[httpx.Response]
             Future object containing HTTP response.
         """
-        return self.executor.submit(self._delete, name)
+        return self._submit(self._async.delete, name)
 
     def list(self) -> Future[httpx.Response]:
         """
@@ -95,7 +301,7 @@ class Broadcast:
         Future[httpx.Response]
             Future object containing JSON response with endpoint names.
         """
-        return self.executor.submit(self._get, "")
+        return self._submit(self._async.list)
 
     def latest(self, endpoint: str = "default") -> Future[httpx.Response]:
         """
@@ -111,16 +317,107 @@ class Broadcast:
         Future[httpx.Response]
             Future object containing latest data as JSON.
         """
-        return self.executor.submit(self._get, f"{endpoint}/latest")
+        return self._submit(self._async.latest, endpoint)
+
+    def latest_parsed(self, endpoint: str = "default") -> Future[Any]:
+        """
+        Get latest data from a broadcast endpoint, already decoded from JSON.
+
+        Parameters
+        ----------
+        endpoint : str, optional
+            Target endpoint name. Default is "default".
+
+        Returns
+        -------
+        Future[Any]
+            Future object containing the decoded data. Resolves with
+            `httpx.HTTPStatusError` if the server answers with an error status.
+        """
+        return self._submit(self._async.latest_parsed, endpoint)
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise RuntimeError("Broadcast is closed")
+
+    def _submit(self, fn: Callable[..., Awaitable[Any]], *args: Any) -> Future[Any]:
+        with self._lock:
+            self._check_open()
+            if self._queue is None:
+                return asyncio.run_coroutine_threadsafe(
+                    self._run_limited(fn, *args), self._loop
+                )
+            future: Future[Any] = Future()
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, (fn, args, future))
+            return future
+
+    async def _run_limited(self, fn: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        async with self._limit:
+            return await fn(*args)
+
+    async def _consume(self) -> None:
+        assert self._queue is not None
+        while True:
+            fn, args, future = await self._queue.get()
+            try:
+                if future.set_running_or_notify_cancel():
+                    try:
+                        result = await fn(*args)
+                    except Exception as exc:
+                        future.set_exception(exc)
+                    else:
+                        future.set_result(result)
+            finally:
+                self._queue.task_done()
 
-    def _get(self, path: str) -> httpx.Response:
-        return self.client.get(urljoin(_BASEURL, path))
+    def _flush(self, due: float | None = None) -> None:
+        # Post every buffer, or only those whose oldest record arrived by `due`.
+        with self._lock:
+            batches = [
+                (endpoint, items)
+                for endpoint, (started, items) in self._buffers.items()
+                if due is None or started <= due
+            ]
+            for endpoint, items in batches:
+                del self._buffers[endpoint]
+                self._submit(self._deliver_batch, endpoint, items)
 
-    def _post(self, endpoint: str, data: Dict[str, Any]) -> httpx.Response:
-        return self.client.post(urljoin(_BASEURL, endpoint), json=data)
+    async def _deliver_batch(self, endpoint: str, items: List[_Item]) -> None:
+        items = [item for item in items if item[1].set_running_or_notify_cancel()]
+        if not items:
+            return
+        try:
+            response = await self._async.send_many(
+                [data for data, _ in items], endpoint
+            )
+        except Exception as exc:
+            for _, future in items:
+                future.set_exception(exc)
+        else:
+            for _, future in items:
+                future.set_result(response)
 
-    def _post_create(self, name: str) -> httpx.Response:
-        return self.client.post(_BASEURL, json={"name": name})
+    async def _flush_loop(self) -> None:
+        while True:
+            with self._lock:
+                oldest = min(
+                    (started for started, _ in self._buffers.values()), default=None
+                )
+            if oldest is None:
+                await asyncio.sleep(self.flush_interval)
+                continue
+            delay = oldest + self.flush_interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                self._flush(due=time.monotonic() - self.flush_interval)
 
-    def _delete(self, name: str) -> httpx.Response:
-        return self.client.delete(urljoin(_BASEURL, name))
+    async def _shutdown(self) -> None:
+        if self._queue is not None:
+            await self._queue.join()
+        for task in self._tasks:
+            task.cancel()
+        current = asyncio.current_task()
+        pending = [task for task in asyncio.all_tasks() if task is not current]
+        await asyncio.gather(*pending, return_exceptions=True)
+        await self._async.aclose()
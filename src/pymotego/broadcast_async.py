@@ -0,0 +1,289 @@
+import httpx
+from urllib.parse import urljoin
+from typing import Dict, Any, Iterable
+
+from pymotego._codec import (
+    GZIP_JSON_HEADERS,
+    JSON_HEADERS,
+    Compression,
+    check_compression,
+    columnar_batch,
+    encode_body,
+    gzip_dumps,
+    json_dumps,
+    json_loads,
+)
+from pymotego._h2 import tuned_transport
+from pymotego.constants import (
+    DEFAULT_API_BASE_URL,
+    DEFAULT_HTTP_LIMITS,
+    DEFAULT_HTTP_TIMEOUT,
+    HTTP2_MULTIPLEXED,
+)
+
+_BASEURL = urljoin(DEFAULT_API_BASE_URL, "broadcast/data/")
+
+
+def _connection_limits(connections: int) -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=connections,
+        max_keepalive_connections=connections,
+        keepalive_expiry=300.0,
+    )
+
+
+class AsyncBroadcast:
+    """
+    Asyncio HTTP broadcast client for sending experimental data to cogmoteGO.
+
+    Coroutine counterpart of `Broadcast`: requests are awaited directly on the
+    running event loop with HTTP/2 support instead of being handed to a thread
+    pool. Any asyncio-compatible loop works, including ones installed through
+    `asyncio.set_event_loop_policy` (e.g. uvloop).
+
+    Parameters
+    ----------
+    connections : int, optional
+        Number of pooled connections to the server. When HTTP/2 is available
+        (https base URL) the default is a single connection carrying every
+        request as a multiplexed stream; otherwise the shared default pool
+        limits apply.
+    compress : {"none", "gzip", "zstd", "auto"}, optional
+        Request body compression. ``"auto"`` gzips bodies of 1 KiB or more;
+        ``"zstd"`` needs Python 3.14+ or the ``zstandard`` package. The server
+        must decode the ``Content-Encoding`` it receives. Default is "none".
+    h2_window_bytes : int, optional
+        HTTP/2 initial stream flow-control window advertised to the server,
+        e.g. ``1 << 20``. Default keeps httpx's value (64 KiB).
+    h2_max_streams : int, optional
+        HTTP/2 concurrent stream limit advertised to the server, which is also
+        the cap on requests in flight per connection, e.g. ``1000``. Default
+        keeps httpx's value (100).
+
+    Notes
+    -----
+    `send_many` posts a JSON array whose elements are the individual records,
+    so the target endpoint must accept an array body.
+
+    Setting `h2_window_bytes` or `h2_max_streams` gives the client its own
+    transport, so proxies from the ``HTTP_PROXY``, ``HTTPS_PROXY`` and
+    ``ALL_PROXY`` environment variables are not used.
+    """
+
+    def __init__(
+        self,
+        connections: int | None = None,
+        compress: Compression = "none",
+        h2_window_bytes: int | None = None,
+        h2_max_streams: int | None = None,
+    ) -> None:
+        check_compression(compress)
+        self.compress = compress
+        self._url_cache: Dict[str, httpx.URL] = {}
+        if connections is not None and connections <= 0:
+            raise ValueError("connections must be greater than 0")
+        if connections is None and HTTP2_MULTIPLEXED:
+            connections = 1
+        limits = (
+            DEFAULT_HTTP_LIMITS
+            if connections is None
+            else _connection_limits(connections)
+        )
+        if h2_window_bytes is None and h2_max_streams is None:
+            self.client = httpx.AsyncClient(
+                http2=True, limits=limits, timeout=DEFAULT_HTTP_TIMEOUT
+            )
+        else:
+            self.client = httpx.AsyncClient(
+                transport=tuned_transport(limits, h2_window_bytes, h2_max_streams),
+                timeout=DEFAULT_HTTP_TIMEOUT,
+            )
+
+    async def aclose(self) -> None:
+        """
+        Release HTTP client resources.
+
+        Should be awaited when the AsyncBroadcast instance is no longer needed.
+        """
+        await self.client.aclose()
+
+    async def __aenter__(self) -> "AsyncBroadcast":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.aclose()
+
+    async def send(
+        self, data: Dict[str, Any], endpoint: str = "default"
+    ) -> httpx.Response:
+        """
+        Send data to a broadcast endpoint.
+
+        Parameters
+        ----------
+        data : Dict[str, Any]
+            Dictionary payload to be sent (auto-serialized to JSON).
+        endpoint : str, optional
+            Target endpoint name. Default is "default".
+
+        Returns
+        -------
+        httpx.Response
+            HTTP response.
+
+        Examples
+        --------
+        >>> async with AsyncBroadcast() as broadcaster:
+        ...     response = await broadcaster.send({"trial_id": 1})
+        """
+        body, headers = encode_body(json_dumps(data), self.compress)
+        return await self.client.post(
+            self._url(endpoint), content=body, headers=headers
+        )
+
+    async def send_many(
+        self, data_list: Iterable[Dict[str, Any]], endpoint: str = "default"
+    ) -> httpx.Response:
+        """
+        Send several records to a broadcast endpoint in a single request.
+
+        Parameters
+        ----------
+        data_list : Iterable[Dict[str, Any]]
+            Payloads to be sent, serialized together as one JSON array.
+        endpoint : str, optional
+            Target endpoint name. Default is "default".
+
+        Returns
+        -------
+        httpx.Response
+            HTTP response.
+        """
+        body, headers = encode_body(json_dumps(list(data_list)), self.compress)
+        return await self.client.post(
+            self._url(endpoint), content=body, headers=headers
+        )
+
+    async def send_batch_columnar(
+        self, records: Iterable[Dict[str, Any]], endpoint: str = "default"
+    ) -> httpx.Response:
+        """
+        Send several records in a compact column-oriented, gzip-encoded body.
+
+        Field names are emitted once in a ``schema`` list and each record becomes
+        a row of values in that order, which pays off for homogeneous records
+        that repeat the same keys. Records missing a field send ``null`` for it.
+
+        Parameters
+        ----------
+        records : Iterable[Dict[str, Any]]
+            Payloads to be sent.
+        endpoint : str, optional
+            Target endpoint name. Default is "default".
+
+        Returns
+        -------
+        httpx.Response
+            HTTP response.
+
+        Notes
+        -----
+        The body is ``{"schema": [...], "rows": [[...], ...]}`` sent with
+        ``Content-Encoding: gzip``; the server must decode this format. Use
+        `send_many` for servers that only accept plain record arrays.
+        """
+        return await self.client.post(
+            self._url(endpoint),
+            content=gzip_dumps(columnar_batch(records)),
+            headers=GZIP_JSON_HEADERS,
+        )
+
+    async def create(self, name: str) -> httpx.Response:
+        """
+        Create a new broadcast endpoint.
+
+        Parameters
+        ----------
+        name : str
+            Name of the endpoint to create.
+
+        Returns
+        -------
+        httpx.Response
+            HTTP response.
+        """
+        return await self.client.post(
+            self._url(""), content=json_dumps({"name": name}), headers=JSON_HEADERS
+        )
+
+    async def delete(self, name: str) -> httpx.Response:
+        """
+        Delete a broadcast endpoint.
+
+        Parameters
+        ----------
+        name : str
+            Name of the endpoint to delete.
+
+        Returns
+        -------
+        httpx.Response
+            HTTP response.
+        """
+        return await self.client.delete(self._url(name))
+
+    async def list(self) -> httpx.Response:
+        """
+        List all broadcast endpoints.
+
+        Returns
+        -------
+        httpx.Response
+            JSON response with endpoint names.
+        """
+        return await self.client.get(self._url(""))
+
+    async def latest(self, endpoint: str = "default") -> httpx.Response:
+        """
+        Get latest data from a broadcast endpoint.
+
+        Parameters
+        ----------
+        endpoint : str, optional
+            Target endpoint name. Default is "default".
+
+        Returns
+        -------
+        httpx.Response
+            Latest data as JSON.
+        """
+        return await self.client.get(self._url(f"{endpoint}/latest"))
+
+    async def latest_parsed(self, endpoint: str = "default") -> Any:
+        """
+        Get latest data from a broadcast endpoint, already decoded from JSON.
+
+        Parameters
+        ----------
+        endpoint : str, optional
+            Target endpoint name. Default is "default".
+
+        Returns
+        -------
+        Any
+            Decoded data.
+
+        Raises
+        ------
+        httpx.HTTPStatusError
+            If the server answers with an error status.
+        """
+        response = await self.client.get(self._url(f"{endpoint}/latest"))
+        response.raise_for_status()
+        return json_loads(response.content)
+
+    def _url(self, path: str) -> httpx.URL:
+        url = self._url_cache.get(path)
+        if url is None:
+            url = self._url_cache[path] = httpx.URL(urljoin(_BASEURL, path))
+        return url
@@ -1,3 +1,13 @@
 """Shared configuration constants for pymoteGO clients."""
 
+import httpx
+
 DEFAULT_API_BASE_URL = "http://localhost:9012/api/"
+# httpx only negotiates HTTP/2 over TLS; cleartext servers are spoken to over
+# HTTP/1.1, where a connection carries one request at a time.
+HTTP2_MULTIPLEXED = DEFAULT_API_BASE_URL.startswith("https://")
+
+DEFAULT_HTTP_LIMITS = httpx.Limits(
+    max_connections=1000, max_keepalive_connections=100, keepalive_expiry=60.0
+)
+DEFAULT_HTTP_TIMEOUT = httpx.Timeout(10.0, connect=3.0)
@@ -1,14 +1,35 @@
-import base64
-from dataclasses import asdict, dataclass
+import mmap
+import os
+import stat
+from contextlib import ExitStack
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, Sequence
-
-from httpx import Client, Response, URL
-
-from pymotego.constants import DEFAULT_API_BASE_URL
+from typing import IO, Iterable, Sequence
+
+from httpx import Client, Limits, Response, URL
+
+from pymotego._codec import (
+    MSGPACK_HEADERS,
+    Codec,
+    Compression,
+    b64encode,
+    check_codec,
+    check_compression,
+    encode_body,
+    json_dumps,
+    json_loads,
+    msgpack_dumps,
+)
+from pymotego.constants import (
+    DEFAULT_API_BASE_URL,
+    DEFAULT_HTTP_LIMITS,
+    DEFAULT_HTTP_TIMEOUT,
+)
 
 EMAIL_ENDPOINT = "email"
 
+_MultipartFile = tuple[str, tuple[str, bytes | IO[bytes], str]]
+
 
 class EmailSendError(Exception):
     """Raised when email sending fails."""
@@ -18,7 +39,7 @@ class EmailSendError(Exception):
         self.response = response
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SendResult:
     """Result of a successful email send operation."""
 
@@ -26,7 +47,7 @@ class SendResult:
     response: Response
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class EmailAttachment:
     """Container for email attachments."""
 
@@ -34,15 +55,7 @@ class EmailAttachment:
     content: bytes
 
 
-@dataclass(frozen=True)
-class EmailAttachmentPayload:
-    """Serialized attachment ready for transport."""
-
-    filename: str
-    content: str
-
-
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class EmailEmbed:
     """Container for embedded images in HTML emails."""
 
@@ -51,35 +64,58 @@ class EmailEmbed:
     content: bytes
 
 
-@dataclass(frozen=True)
-class EmailEmbedPayload:
-    """Serialized embed ready for transport."""
-
-    content_id: str
-    filename: str
-    content: str
-
-
-@dataclass(frozen=True)
-class EmailPayload:
-    subject: str
-    html_body: str
-    attachments: list[EmailAttachmentPayload] | None = None
-    embeds: list[EmailEmbedPayload] | None = None
-    in_reply_to: str | None = None
-
-
 class EmailClient:
     """Synchronous HTTP client for cogmoteGO email API."""
 
-    def __init__(self) -> None:
-        """Configure client with HTTP/2 enabled connection pooling."""
+    def __init__(
+        self,
+        compress: Compression = "none",
+        codec: Codec = "json",
+        http2: bool = True,
+        max_connections_per_host: int = 10,
+    ) -> None:
+        """Configure client with HTTP/2 enabled connection pooling.
+
+        HTTP/2 suits many small emails sharing one connection. For large
+        attachments over high-latency links, `http2=False` switches to HTTP/1.1
+        with up to `max_connections_per_host` parallel connections, avoiding
+        head-of-line blocking on a single TCP stream.
+
+        `compress` selects JSON body compression (`"none"`, `"gzip"`, `"zstd"`,
+        or `"auto"` to gzip bodies of 1 KiB or more); the server must decode the
+        `Content-Encoding` it receives.
+
+        `codec="msgpack"` sends bodies as `application/msgpack` with attachment
+        and embed bytes as raw binary, skipping base64; it needs the `msgpack`
+        package and a server that accepts MessagePack, and cannot be combined
+        with `compress`.
+        """
+        check_compression(compress)
+        check_codec(codec)
+        if codec == "msgpack" and compress != "none":
+            raise ValueError("compress is only supported with the json codec")
+        self._compress = compress
+        self._codec = codec
         base_url = URL(DEFAULT_API_BASE_URL)
         path = base_url.path
         if not path.endswith("/"):
             base_url = base_url.copy_with(path=path.rstrip("/") + "/")
 
-        self._client = Client(base_url=base_url, http2=True)
+        limits = (
+            DEFAULT_HTTP_LIMITS
+            if http2
+            else Limits(
+                max_connections=max_connections_per_host,
+                max_keepalive_connections=max_connections_per_host,
+            )
+        )
+        self._client = Client(
+            base_url=base_url,
+            http2=http2,
+            limits=limits,
+            timeout=DEFAULT_HTTP_TIMEOUT,
+        )
+        # Kept as an httpx.URL: httpx copies URL objects as is but re-parses str.
         self._email_url = base_url.join(EMAIL_ENDPOINT)
 
     def send(
@@ -89,29 +125,35 @@ class EmailClient:
         attachments: Sequence[EmailAttachment] | None = None,
         embeds: Sequence[EmailEmbed] | None = None,
         in_reply_to: str | None = None,
+        multipart: bool = False,
     ) -> SendResult:
-        """Send an email payload to cogmoteGO."""
-        attachments_payload = _prepare_attachments(attachments)
-        embeds_payload = _prepare_embeds(embeds)
-        payload = EmailPayload(
-            subject=subject,
-            html_body=html_body,
-            attachments=attachments_payload,
-            embeds=embeds_payload,
-            in_reply_to=in_reply_to,
-        )
-
-        response = self._client.post(self._email_url, json=asdict(payload))
-
-        if not response.is_success:
-            raise EmailSendError(
-                f"Failed to send email: {response.status_code}", response
+        """Send an email payload to cogmoteGO.
+
+        With `multipart=True`, attachments and embeds are uploaded as raw binary
+        `multipart/form-data` parts instead of base64 strings inside the JSON
+        body; the remaining fields travel as JSON in the `payload` part. Keep the
+        default JSON transport for servers without multipart support.
+        """
+        if multipart and (attachments or embeds):
+            files: list[_MultipartFile] = [
+                ("attachments", (a.filename, a.content, "application/octet-stream"))
+                for a in attachments or ()
+            ]
+            files.extend(_embed_parts(embeds))
+            return self._send_multipart(
+                _multipart_meta(subject, html_body, embeds, in_reply_to), files
+            )
+        if self._codec == "msgpack":
+            return self._send_msgpack(
+                _binary_payload(subject, html_body, attachments, embeds, in_reply_to)
             )
 
-        return SendResult(
-            message_id=response.json()["message_id"],
-            response=response,
-        )
+        payload = _base_payload(subject, html_body, in_reply_to)
+        if attachments:
+            payload["attachments"] = _prepare_attachments(attachments)
+        if embeds:
+            payload["embeds"] = _prepare_embeds(embeds)
+        return self._send_payload(payload)
 
     def send_with_files(
         self,
@@ -120,19 +162,69 @@ class EmailClient:
         files: Iterable[tuple[str, str | Path]],
         embeds: Sequence[EmailEmbed] | None = None,
         in_reply_to: str | None = None,
+        multipart: bool = False,
     ) -> SendResult:
-        """Send emails where attachments are described by `(filename, path)` tuples."""
-        attachments = [
-            EmailAttachment(filename=filename, content=_read_file_bytes(path))
-            for filename, path in files
-        ]
-        return self.send(
-            subject=subject,
-            html_body=html_body,
-            attachments=attachments,
-            embeds=embeds,
-            in_reply_to=in_reply_to,
+        """Send emails where attachments are described by `(filename, path)` tuples.
+
+        With `multipart=True`, files are streamed from disk as binary parts.
+        """
+        files = list(files)
+        if multipart and (files or embeds):
+            with ExitStack() as stack:
+                parts: list[_MultipartFile] = [
+                    (
+                        "attachments",
+                        (
+                            filename,
+                            stack.enter_context(Path(path).expanduser().open("rb")),
+                            "application/octet-stream",
+                        ),
+                    )
+                    for filename, path in files
+                ]
+                parts.extend(_embed_parts(embeds))
+                return self._send_multipart(
+                    _multipart_meta(subject, html_body, embeds, in_reply_to), parts
+                )
+        if self._codec == "msgpack":
+            attachments = [
+                EmailAttachment(
+                    filename=filename, content=Path(path).expanduser().read_bytes()
+                )
+                for filename, path in files
+            ]
+            return self._send_msgpack(
+                _binary_payload(subject, html_body, attachments, embeds, in_reply_to)
+            )
+
+        payload = _base_payload(subject, html_body, in_reply_to)
+        if files:
+            payload["attachments"] = [
+                {"filename": filename, "content": _encode_file(path)}
+                for filename, path in files
+            ]
+        if embeds:
+            payload["embeds"] = _prepare_embeds(embeds)
+        return self._send_payload(payload)
+
+    def _send_payload(self, payload: dict[str, object]) -> SendResult:
+        body, headers = encode_body(json_dumps(payload), self._compress)
+        response = self._client.post(self._email_url, content=body, headers=headers)
+        return _parse_response(response)
+
+    def _send_msgpack(self, payload: dict[str, object]) -> SendResult:
+        response = self._client.post(
+            self._email_url, content=msgpack_dumps(payload), headers=MSGPACK_HEADERS
         )
+        return _parse_response(response)
+
+    def _send_multipart(
+        self, meta: dict[str, object], files: list[_MultipartFile]
+    ) -> SendResult:
+        response = self._client.post(
+            self._email_url, data={"payload": json_dumps(meta)}, files=files
+        )
+        return _parse_response(response)
 
     def close(self) -> None:
         """Release underlying HTTP resources."""
@@ -145,48 +237,112 @@ class EmailClient:
         self.close()
 
 
-def _encode_attachment(content: bytes) -> str:
-    """Encode raw attachment bytes to base64 for JSON transport."""
-    return base64.b64encode(content).decode("ascii")
+def _parse_response(response: Response) -> SendResult:
+    if not response.is_success:
+        raise EmailSendError(f"Failed to send email: {response.status_code}", response)
 
+    return SendResult(
+        message_id=json_loads(response.content)["message_id"],
+        response=response,
+    )
 
-def _prepare_attachments(
-    attachments: Sequence[EmailAttachment] | None,
-) -> list["EmailAttachmentPayload"] | None:
-    if not attachments:
-        return None
-
-    prepared: list[EmailAttachmentPayload] = []
-    for attachment in attachments:
-        prepared.append(
-            EmailAttachmentPayload(
-                filename=attachment.filename,
-                content=_encode_attachment(attachment.content),
-            )
-        )
-    return prepared
+
+def _base_payload(
+    subject: str, html_body: str, in_reply_to: str | None
+) -> dict[str, object]:
+    return {"subject": subject, "html_body": html_body, "in_reply_to": in_reply_to}
 
 
-def _prepare_embeds(
+def _multipart_meta(
+    subject: str,
+    html_body: str,
     embeds: Sequence[EmailEmbed] | None,
-) -> list["EmailEmbedPayload"] | None:
-    if not embeds:
-        return None
-
-    prepared: list[EmailEmbedPayload] = []
-    for embed in embeds:
-        prepared.append(
-            EmailEmbedPayload(
-                content_id=embed.content_id,
-                filename=embed.filename,
-                content=_encode_attachment(embed.content),
-            )
-        )
-    return prepared
+    in_reply_to: str | None,
+) -> dict[str, object]:
+    """Build the JSON `payload` part; embed bytes follow in the same order."""
+    meta = _base_payload(subject, html_body, in_reply_to)
+    if embeds:
+        meta["embeds"] = [
+            {"content_id": embed.content_id, "filename": embed.filename}
+            for embed in embeds
+        ]
+    return meta
 
 
-def _read_file_bytes(path: str | Path) -> bytes:
-    return Path(path).expanduser().read_bytes()
+def _binary_payload(
+    subject: str,
+    html_body: str,
+    attachments: Sequence[EmailAttachment] | None,
+    embeds: Sequence[EmailEmbed] | None,
+    in_reply_to: str | None,
+) -> dict[str, object]:
+    """Build the MessagePack body, keeping attachment and embed bytes raw."""
+    payload = _base_payload(subject, html_body, in_reply_to)
+    if attachments:
+        payload["attachments"] = [
+            {"filename": attachment.filename, "content": attachment.content}
+            for attachment in attachments
+        ]
+    if embeds:
+        payload["embeds"] = [
+            {
+                "content_id": embed.content_id,
+                "filename": embed.filename,
+                "content": embed.content,
+            }
+            for embed in embeds
+        ]
+    return payload
+
+
+def _embed_parts(embeds: Sequence[EmailEmbed] | None) -> list[_MultipartFile]:
+    return [
+        ("embeds", (embed.filename, embed.content, "application/octet-stream"))
+        for embed in embeds or ()
+    ]
+
+
+def _encode_attachment(content: bytes) -> str:
+    """Encode raw attachment bytes to base64 for JSON transport."""
+    return b64encode(content).decode("ascii")
+
+
+def _prepare_attachments(
+    attachments: Sequence[EmailAttachment],
+) -> list[dict[str, str]]:
+    return [
+        {
+            "filename": attachment.filename,
+            "content": _encode_attachment(attachment.content),
+        }
+        for attachment in attachments
+    ]
+
+
+def _prepare_embeds(embeds: Sequence[EmailEmbed]) -> list[dict[str, str]]:
+    return [
+        {
+            "content_id": embed.content_id,
+            "filename": embed.filename,
+            "content": _encode_attachment(embed.content),
+        }
+        for embed in embeds
+    ]
+
+
+def _encode_file(path: str | Path) -> str:
+    """Base64-encode a file, through a read-only memory map when possible.
+
+    For non-empty regular files the encoder reads pages straight from the
+    mapping, so the raw contents are never copied into a `bytes` object first.
+    Pipes, devices and files reporting a zero size (e.g. under /proc) are read.
+    """
+    with Path(path).expanduser().open("rb") as file:
+        info = os.fstat(file.fileno())
+        if not stat.S_ISREG(info.st_mode) or info.st_size == 0:
+            return b64encode(file.read()).decode("ascii")
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return b64encode(mapped).decode("ascii")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,308 @@
+import asyncio
+import gzip
+import json
+import subprocess
+import sys
+import textwrap
+import time
+import warnings
+from pathlib import Path
+
+import httpx
+import pytest
+
+from pymotego import _codec
+from pymotego._codec import AUTO_COMPRESS_MIN_BYTES, check_compression, encode_body
+from pymotego.broadcast import Broadcast
+
+
+class Server:
+    """Records the requests a mock transport receives."""
+
+    def __init__(self) -> None:
+        self.requests: list[tuple[str, object]] = []
+        self.headers: list[httpx.Headers] = []
+        self.delay = 0.0
+        self.error: Exception | None = None
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        content = request.content
+        encoding = request.headers.get("content-encoding")
+        if encoding == "gzip":
+            content = gzip.decompress(content)
+        elif encoding == "zstd":
+            content = _codec.zstd.decompress(content)
+        body = json.loads(content) if content else None
+        self.requests.append((request.url.path, body))
+        self.headers.append(request.headers)
+        return httpx.Response(200, json={"ok": True})
+
+
+@pytest.fixture
+def server(monkeypatch: pytest.MonkeyPatch) -> Server:
+    server = Server()
+    client_cls = httpx.AsyncClient
+
+    def mock_client(**kwargs: object) -> httpx.AsyncClient:
+        return client_cls(
+            transport=httpx.MockTransport(server), timeout=kwargs.get("timeout")
+        )
+
+    monkeypatch.setattr(httpx, "AsyncClient", mock_client)
+    return server
+
+
+def test_ordered_delivery(server: Server) -> None:
+    broadcaster = Broadcast(ordered=True)
+    server.delay = 0.001
+    futures = [broadcaster.send({"i": i}) for i in range(30)]
+    broadcaster.close()
+
+    assert all(future.done() for future in futures)
+    assert [body["i"] for _, body in server.requests] == list(range(30))
+
+
+def test_ordered_delivery_with_batching(server: Server) -> None:
+    broadcaster = Broadcast(ordered=True, max_batch=3, flush_interval=0.001)
+    for i in range(300):
+        broadcaster.send({"i": i})
+        if i % 7 == 0:
+            time.sleep(0.001)
+    broadcaster.close()
+
+    records = [record["i"] for _, body in server.requests for record in body]
+    assert records == list(range(300))
+
+
+def test_batches_split_at_max_batch(server: Server) -> None:
+    broadcaster = Broadcast(max_batch=3, flush_interval=60)
+    futures = [broadcaster.send({"i": i}) for i in range(7)]
+    for future in futures[:6]:
+        assert future.result(timeout=5).status_code == 200
+    assert not futures[6].done()
+
+    broadcaster.flush()
+    futures[6].result(timeout=5)
+    broadcaster.close()
+
+    assert sorted(len(body) for _, body in server.requests) == [1, 3, 3]
+    records = sorted(record["i"] for _, body in server.requests for record in body)
+    assert records == list(range(7))
+
+
+def test_flush_groups_by_endpoint(server: Server) -> None:
+    broadcaster = Broadcast(max_batch=10, flush_interval=60)
+    broadcaster.send({"i": 0}, endpoint="a")
+    broadcaster.send({"i": 1}, endpoint="b")
+    broadcaster.send({"i": 2}, endpoint="a")
+    broadcaster.close()
+
+    bodies = dict(server.requests)
+    assert bodies["/api/broadcast/data/a"] == [{"i": 0}, {"i": 2}]
+    assert bodies["/api/broadcast/data/b"] == [{"i": 1}]
+
+
+def test_max_batch_counts_per_endpoint(server: Server) -> None:
+    broadcaster = Broadcast(max_batch=2, flush_interval=60)
+    futures = [
+        broadcaster.send({"i": 0}, endpoint="a"),
+        broadcaster.send({"i": 1}, endpoint="b"),
+        broadcaster.send({"i": 2}, endpoint="a"),
+    ]
+    futures[2].result(timeout=5)
+    assert not futures[1].done()
+    assert server.requests == [("/api/broadcast/data/a", [{"i": 0}, {"i": 2}])]
+    broadcaster.close()
+
+
+def test_flush_interval_bounds_wait_after_full_batch(server: Server) -> None:
+    broadcaster = Broadcast(max_batch=2, flush_interval=0.2)
+    time.sleep(0.21)
+    broadcaster.send({"i": 0})
+    broadcaster.send({"i": 1})
+    start = time.monotonic()
+    broadcaster.send({"i": 2}).result(timeout=5)
+    waited = time.monotonic() - start
+    broadcaster.close()
+
+    assert 0.15 <= waited < 0.3
+
+
+def test_flush_interval_posts_partial_batch(server: Server) -> None:
+    broadcaster = Broadcast(max_batch=10, flush_interval=0.01)
+    future = broadcaster.send({"i": 0})
+    assert future.result(timeout=5).status_code == 200
+    broadcaster.close()
+
+    assert server.requests == [("/api/broadcast/data/default", [{"i": 0}])]
+
+
+@pytest.mark.parametrize(
+    "options", [{}, {"ordered": True}, {"max_batch": 2, "flush_interval": 60}]
+)
+def test_errors_propagate_to_futures(server: Server, options: dict) -> None:
+    server.error = httpx.ConnectError("refused")
+    broadcaster = Broadcast(**options)
+    futures = [broadcaster.send({"i": i}) for i in range(2)]
+    for future in futures:
+        with pytest.raises(httpx.ConnectError):
+            future.result(timeout=5)
+
+    server.error = None
+    assert broadcaster.list().result(timeout=5).status_code == 200
+    broadcaster.close()
+
+
+def test_close_drains_pending_sends(server: Server) -> None:
+    server.delay = 0.02
+    broadcaster = Broadcast(max_workers=4, max_batch=1)
+    futures = [broadcaster.send({"i": i}) for i in range(10)]
+    broadcaster.close()
+
+    assert all(future.done() for future in futures)
+    assert len(server.requests) == 10
+
+
+def test_close_flushes_buffer(server: Server) -> None:
+    broadcaster = Broadcast(max_batch=100, flush_interval=60)
+    future = broadcaster.send({"i": 0})
+    broadcaster.close()
+
+    assert future.done()
+    assert server.requests == [("/api/broadcast/data/default", [{"i": 0}])]
+
+
+def test_close_twice(server: Server) -> None:
+    broadcaster = Broadcast()
+    broadcaster.send({"i": 0})
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        broadcaster.close()
+        broadcaster.close()
+
+    assert len(server.requests) == 1
+
+
+@pytest.mark.parametrize("options", [{}, {"ordered": True}, {"max_batch": 5}])
+def test_use_after_close(server: Server, options: dict) -> None:
+    broadcaster = Broadcast(**options)
+    broadcaster.close()
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        with pytest.raises(RuntimeError, match="Broadcast is closed"):
+            broadcaster.send({"i": 0})
+        with pytest.raises(RuntimeError, match="Broadcast is closed"):
+            broadcaster.flush()
+        with pytest.raises(RuntimeError, match="Broadcast is closed"):
+            broadcaster.list()
+
+    assert server.requests == []
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"max_workers": 0},
+        {"max_workers": -1},
+        {"connections": 0},
+        {"max_batch": 0},
+        {"max_batch": 2, "flush_interval": 0},
+    ],
+)
+def test_rejects_non_positive_sizes(server: Server, options: dict) -> None:
+    with pytest.raises(ValueError):
+        Broadcast(**options)
+
+
+@pytest.mark.parametrize("value", ["0", "many"])
+def test_rejects_bad_workers_env(
+    server: Server, monkeypatch: pytest.MonkeyPatch, value: str
+) -> None:
+    monkeypatch.setenv("PYMOTEGO_WORKERS", value)
+    with pytest.raises(ValueError):
+        Broadcast()
+
+
+def test_unclosed_sends_are_delivered_at_exit() -> None:
+    script = textwrap.dedent(
+        """
+        import asyncio
+        import httpx
+        from pymotego.broadcast import Broadcast
+
+        async def handler(request):
+            await asyncio.sleep(0.01)
+            print("delivered", flush=True)
+            return httpx.Response(200)
+
+        client_cls = httpx.AsyncClient
+        httpx.AsyncClient = lambda **kwargs: client_cls(
+            transport=httpx.MockTransport(handler)
+        )
+        broadcaster = Broadcast()
+        for i in range(20):
+            broadcaster.send({"i": i})
+        """
+    )
+    src = Path(__file__).resolve().parents[1] / "src"
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        timeout=30,
+        env={"PYTHONPATH": str(src)},
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.count("delivered") == 20
+
+
+@pytest.mark.parametrize("size, compressed", [(10, False), (4096, True)])
+def test_auto_compression_threshold(
+    server: Server, size: int, compressed: bool
+) -> None:
+    record = {"text": "x" * size}
+    broadcaster = Broadcast(compress="auto")
+    broadcaster.send(record).result(timeout=5)
+    broadcaster.close()
+
+    assert server.requests == [("/api/broadcast/data/default", record)]
+    encoding = server.headers[0].get("content-encoding")
+    assert encoding == ("gzip" if compressed else None)
+
+
+def test_auto_compression_boundary() -> None:
+    small = b"x" * (AUTO_COMPRESS_MIN_BYTES - 1)
+    large = b"x" * AUTO_COMPRESS_MIN_BYTES
+
+    assert encode_body(small, "auto") == (small, _codec.JSON_HEADERS)
+    body, headers = encode_body(large, "auto")
+    assert headers["content-encoding"] == "gzip"
+    assert gzip.decompress(body) == large
+
+
+@pytest.mark.parametrize("compress", ["gzip", "zstd"])
+def test_compression_round_trip(server: Server, compress: str) -> None:
+    if compress == "zstd" and _codec.zstd is None:
+        pytest.skip("no zstd codec installed")
+    records = [{"i": i, "label": "trial"} for i in range(3)]
+    broadcaster = Broadcast(compress=compress)
+    broadcaster.send(records[0]).result(timeout=5)
+    broadcaster.send_many(records).result(timeout=5)
+    broadcaster.close()
+
+    assert [body for _, body in server.requests] == [records[0], records]
+    for headers in server.headers:
+        assert headers["content-encoding"] == compress
+        assert headers["content-type"] == "application/json"
+
+
+def test_rejects_unknown_compression(server: Server) -> None:
+    with pytest.raises(ValueError):
+        check_compression("bogus")
+    with pytest.raises(ValueError):
+        Broadcast(compress="bogus")
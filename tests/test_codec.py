@@ -0,0 +1,57 @@
+import json
+from datetime import date, datetime, timezone
+
+import pytest
+
+from pymotego import _codec
+from pymotego._codec import json_dumps
+
+PAYLOADS = [
+    {"x": 2**70},
+    {"x": -(2**70), "n": [1, 2**64]},
+    {"t": datetime(2024, 5, 1, 12, 30, 15, 250000)},
+    {"t": datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc), "d": date(2024, 5, 1)},
+    {"t": datetime(2024, 5, 1), "x": 2**70},
+]
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def encoder(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> str:
+    if request.param == "orjson":
+        if _codec.orjson is None:
+            pytest.skip("orjson not installed")
+    else:
+        monkeypatch.setattr(_codec, "orjson", None)
+    return request.param
+
+
+@pytest.mark.parametrize("payload", PAYLOADS)
+def test_paths_encode_alike(payload: dict, monkeypatch: pytest.MonkeyPatch) -> None:
+    if _codec.orjson is None:
+        pytest.skip("orjson not installed")
+    fast = json_dumps(payload)
+    monkeypatch.setattr(_codec, "orjson", None)
+
+    assert fast == json_dumps(payload)
+
+
+def test_wide_int(encoder: str) -> None:
+    assert json_dumps({"x": 2**70}) == b'{"x":1180591620717411303424}'
+
+
+def test_datetime(encoder: str) -> None:
+    encoded = json_dumps({"t": datetime(2024, 5, 1, 12, 30)})
+
+    assert encoded == b'{"t":"2024-05-01T12:30:00"}'
+
+
+def test_tolist(encoder: str) -> None:
+    numpy = pytest.importorskip("numpy")
+    encoded = json_dumps({"a": numpy.arange(3), "m": numpy.eye(2)})
+
+    assert json.loads(encoded) == {"a": [0, 1, 2], "m": [[1.0, 0.0], [0.0, 1.0]]}
+
+
+def test_rejects_unknown_types(encoder: str) -> None:
+    with pytest.raises(TypeError):
+        json_dumps({"x": object()})
@@ -0,0 +1,186 @@
+import base64
+import email.parser
+import json
+import os
+import threading
+from email.message import Message
+from pathlib import Path
+
+import httpx
+import pytest
+
+from pymotego import email as pymotego_email
+from pymotego.email import EmailAttachment, EmailClient, EmailEmbed, _encode_file
+
+EMBED = EmailEmbed(content_id="logo", filename="logo.png", content=b"\x89PNG")
+
+
+@pytest.fixture
+def posted(monkeypatch: pytest.MonkeyPatch) -> list[httpx.Request]:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        request.read()
+        requests.append(request)
+        return httpx.Response(200, json={"message_id": "m1"})
+
+    def mock_client(**kwargs: object) -> httpx.Client:
+        return httpx.Client(
+            base_url=kwargs["base_url"], transport=httpx.MockTransport(handler)
+        )
+
+    monkeypatch.setattr(pymotego_email, "Client", mock_client)
+    return requests
+
+
+def form_parts(request: httpx.Request) -> list[Message]:
+    header = f"Content-Type: {request.headers['content-type']}\r\n\r\n".encode()
+    message = email.parser.BytesParser().parsebytes(header + request.content)
+    return message.get_payload()
+
+
+def part_name(part: Message) -> str:
+    return part.get_param("name", header="content-disposition")
+
+
+def test_send_multipart(posted: list[httpx.Request]) -> None:
+    attachments = [
+        EmailAttachment(filename="a.txt", content=b"first"),
+        EmailAttachment(filename="b.bin", content=bytes(range(256))),
+    ]
+    second = EmailEmbed(content_id="icon", filename="icon.png", content=b"icon")
+    with EmailClient() as client:
+        result = client.send(
+            "Subject",
+            "<p>body</p>",
+            attachments=attachments,
+            embeds=[EMBED, second],
+            in_reply_to="<id@host>",
+            multipart=True,
+        )
+
+    assert result.message_id == "m1"
+    (request,) = posted
+    assert request.url.path == "/api/email"
+    parts = form_parts(request)
+    assert [part_name(part) for part in parts] == [
+        "payload",
+        "attachments",
+        "attachments",
+        "embeds",
+        "embeds",
+    ]
+    assert json.loads(parts[0].get_payload(decode=True)) == {
+        "subject": "Subject",
+        "html_body": "<p>body</p>",
+        "in_reply_to": "<id@host>",
+        "embeds": [
+            {"content_id": "logo", "filename": "logo.png"},
+            {"content_id": "icon", "filename": "icon.png"},
+        ],
+    }
+    files = [(part.get_filename(), part.get_payload(decode=True)) for part in parts[1:]]
+    assert files == [
+        ("a.txt", b"first"),
+        ("b.bin", bytes(range(256))),
+        ("logo.png", b"\x89PNG"),
+        ("icon.png", b"icon"),
+    ]
+
+
+def test_send_with_files_multipart(posted: list[httpx.Request], tmp_path: Path) -> None:
+    report = tmp_path / "report.csv"
+    report.write_bytes(b"a,b\n1,2\n")
+    with EmailClient() as client:
+        client.send_with_files(
+            "Subject", "<p>body</p>", [("data.csv", report)], multipart=True
+        )
+
+    parts = form_parts(posted[0])
+    assert [part_name(part) for part in parts] == ["payload", "attachments"]
+    assert json.loads(parts[0].get_payload(decode=True)) == {
+        "subject": "Subject",
+        "html_body": "<p>body</p>",
+        "in_reply_to": None,
+    }
+    assert parts[1].get_filename() == "data.csv"
+    assert parts[1].get_payload(decode=True) == b"a,b\n1,2\n"
+
+
+def test_multipart_without_files_sends_json(posted: list[httpx.Request]) -> None:
+    with EmailClient() as client:
+        client.send("Subject", "<p>body</p>", multipart=True)
+
+    assert posted[0].headers["content-type"] == "application/json"
+    assert json.loads(posted[0].content)["subject"] == "Subject"
+
+
+def test_send_msgpack(posted: list[httpx.Request]) -> None:
+    msgpack = pytest.importorskip("msgpack")
+    attachment = EmailAttachment(filename="a.bin", content=bytes(range(256)))
+    with EmailClient(codec="msgpack") as client:
+        client.send("Subject", "<p>body</p>", attachments=[attachment], embeds=[EMBED])
+
+    (request,) = posted
+    assert request.headers["content-type"] == "application/msgpack"
+    assert msgpack.unpackb(request.content) == {
+        "subject": "Subject",
+        "html_body": "<p>body</p>",
+        "in_reply_to": None,
+        "attachments": [{"filename": "a.bin", "content": bytes(range(256))}],
+        "embeds": [
+            {"content_id": "logo", "filename": "logo.png", "content": b"\x89PNG"}
+        ],
+    }
+
+
+def test_send_with_files_msgpack(posted: list[httpx.Request], tmp_path: Path) -> None:
+    msgpack = pytest.importorskip("msgpack")
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"\x00\xff")
+    with EmailClient(codec="msgpack") as client:
+        client.send_with_files("Subject", "<p>body</p>", [("data.bin", path)])
+        client.send_with_files("Subject", "<p>body</p>", [])
+
+    with_file, without_file = (msgpack.unpackb(r.content) for r in posted)
+    assert with_file["attachments"] == [
+        {"filename": "data.bin", "content": b"\x00\xff"}
+    ]
+    assert "embeds" not in with_file
+    assert "attachments" not in without_file
+    assert "embeds" not in without_file
+
+
+@pytest.mark.parametrize("compress", ["gzip", "auto"])
+def test_msgpack_rejects_compression(compress: str) -> None:
+    pytest.importorskip("msgpack")
+    with pytest.raises(ValueError):
+        EmailClient(codec="msgpack", compress=compress)
+
+
+@pytest.mark.parametrize("content", [b"", b"hello", os.urandom(70_000)])
+def test_encode_regular_file(tmp_path: Path, content: bytes) -> None:
+    path = tmp_path / "attachment.bin"
+    path.write_bytes(content)
+
+    assert _encode_file(path) == base64.b64encode(content).decode("ascii")
+
+
+@pytest.mark.skipif(not Path("/proc/version").exists(), reason="needs procfs")
+def test_encode_zero_size_proc_file() -> None:
+    content = Path("/proc/version").read_bytes()
+
+    assert content
+    assert base64.b64decode(_encode_file("/proc/version")) == content
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="needs named pipes")
+def test_encode_fifo(tmp_path: Path) -> None:
+    path = tmp_path / "pipe"
+    os.mkfifo(path)
+    writer = threading.Thread(target=path.write_bytes, args=(b"streamed",))
+    writer.start()
+    try:
+        assert base64.b64decode(_encode_file(path)) == b"streamed"
+    finally:
+        writer.join()
@@ -0,0 +1,101 @@
+import asyncio
+
+import h2.config
+import h2.connection
+import h2.events
+import h2.settings
+import hpack
+import httpcore
+import httpx
+import hyperframe.frame
+import pytest
+
+from pymotego._h2 import tuned_transport
+
+H2_RESPONSE = [
+    hyperframe.frame.SettingsFrame().serialize(),
+    hyperframe.frame.HeadersFrame(
+        stream_id=1,
+        data=hpack.Encoder().encode([(b":status", b"200")]),
+        flags=["END_HEADERS"],
+    ).serialize(),
+    hyperframe.frame.DataFrame(
+        stream_id=1, data=b"ok", flags=["END_STREAM"]
+    ).serialize(),
+]
+HTTP11_RESPONSE = [b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok"]
+
+
+class RecordingBackend(httpcore.AsyncMockBackend):
+    """Mock network backend that keeps every byte the client writes."""
+
+    def __init__(self, buffer: list[bytes], http2: bool) -> None:
+        super().__init__(buffer, http2=http2)
+        self.sent = bytearray()
+
+    async def connect_tcp(self, *args, **kwargs) -> httpcore.AsyncNetworkStream:
+        stream = await super().connect_tcp(*args, **kwargs)
+        sent = self.sent
+
+        async def write(buffer: bytes, timeout: float | None = None) -> None:
+            sent.extend(buffer)
+
+        stream.write = write
+        return stream
+
+
+def fetch(
+    backend: RecordingBackend, window_bytes: int | None, max_streams: int | None
+) -> httpx.Response:
+    transport = tuned_transport(httpx.Limits(), window_bytes, max_streams)
+    transport._pool._network_backend = backend
+
+    async def main() -> httpx.Response:
+        async with httpx.AsyncClient(transport=transport) as client:
+            response = await client.get("https://example.com/")
+            await response.aread()
+            return response
+
+    return asyncio.run(main())
+
+
+def sent_settings(data: bytes) -> dict[int, int]:
+    server = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False))
+    for event in server.receive_data(bytes(data)):
+        if isinstance(event, h2.events.RemoteSettingsChanged):
+            return {
+                code: setting.new_value
+                for code, setting in event.changed_settings.items()
+            }
+    raise AssertionError("no SETTINGS frame sent")
+
+
+@pytest.mark.parametrize(
+    "window_bytes, max_streams, expected_window, expected_streams",
+    [(1 << 20, 1000, 1 << 20, 1000), (None, None, 65535, 100)],
+)
+def test_settings_frame(
+    window_bytes: int | None,
+    max_streams: int | None,
+    expected_window: int,
+    expected_streams: int,
+) -> None:
+    backend = RecordingBackend(H2_RESPONSE, http2=True)
+    response = fetch(backend, window_bytes, max_streams)
+
+    assert response.http_version == "HTTP/2"
+    assert response.content == b"ok"
+    settings = sent_settings(backend.sent)
+    codes = h2.settings.SettingCodes
+    assert settings[codes.INITIAL_WINDOW_SIZE] == expected_window
+    assert settings[codes.MAX_CONCURRENT_STREAMS] == expected_streams
+    assert settings[codes.ENABLE_PUSH] == 0
+
+
+def test_falls_back_to_http11() -> None:
+    backend = RecordingBackend(HTTP11_RESPONSE, http2=False)
+    response = fetch(backend, 1 << 20, 1000)
+
+    assert response.http_version == "HTTP/1.1"
+    assert response.content == b"ok"
+    assert bytes(backend.sent).startswith(b"GET / HTTP/1.1\r\n")